@@ -37,14 +37,30 @@ aws dynamodb create-table \
     --attribute-definitions \
         AttributeName=TradeId,AttributeType=S \
         AttributeName=Timestamp,AttributeType=S \
+        AttributeName=date_bucket,AttributeType=S \
     --key-schema \
         AttributeName=TradeId,KeyType=HASH \
         AttributeName=Timestamp,KeyType=RANGE \
+    --global-secondary-indexes \
+        "IndexName=TradeLogs_TimestampIndex,KeySchema=[{AttributeName=date_bucket,KeyType=HASH},{AttributeName=Timestamp,KeyType=RANGE}],Projection={ProjectionType=ALL}" \
     --billing-mode PAY_PER_REQUEST \
     --region $REGION \
     --tags Key=Project,Value=CryonithLLC Key=Environment,Value=Production \
     2>/dev/null || echo "Table CryonithTradeLogs already exists"
 
+# Recent-trade lookups query this index instead of scanning the table.
+# Items written before date_bucket was added are not in the index, so
+# get_recent_trades will not return them.
+aws dynamodb update-table \
+    --table-name CryonithTradeLogs \
+    --attribute-definitions \
+        AttributeName=date_bucket,AttributeType=S \
+        AttributeName=Timestamp,AttributeType=S \
+    --global-secondary-index-updates \
+        "[{\"Create\":{\"IndexName\":\"TradeLogs_TimestampIndex\",\"KeySchema\":[{\"AttributeName\":\"date_bucket\",\"KeyType\":\"HASH\"},{\"AttributeName\":\"Timestamp\",\"KeyType\":\"RANGE\"}],\"Projection\":{\"ProjectionType\":\"ALL\"}}}]" \
+    --region $REGION \
+    2>/dev/null || echo "Index TradeLogs_TimestampIndex already exists"
+
 # 2. Strategy Metrics Table  
 echo -e "${GREEN}🧠 Creating Strategy Metrics Table...${NC}"
 aws dynamodb create-table \
@@ -0,0 +1,163 @@
+"""Tests for ursus_data_logger, run against an in-memory stand-in for the DynamoDB client"""
+
+import json
+import os
+import tempfile
+import uuid
+
+import pytest
+
+pytest.importorskip('boto3')
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+import ursus_data_logger as udl
+
+class FakeClient:
+    """Accepts puts unless told to fail; items carrying a 'poison' attribute are rejected"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.written = []  # (table_name, item)
+
+    def batch_write_item(self, RequestItems):
+        if self.error:
+            raise self.error
+        items = [(table_name, request['PutRequest']['Item'])
+                 for table_name, requests in RequestItems.items() for request in requests]
+        if any('poison' in item for _, item in items):
+            raise _client_error('ValidationException', 'BatchWriteItem')
+        self.written.extend(items)
+        return {}
+
+    def put_item(self, TableName, Item):
+        if self.error:
+            raise self.error
+        if 'poison' in Item:
+            raise _client_error('ValidationException', 'PutItem')
+        self.written.append((TableName, Item))
+        return {}
+
+def _client_error(code, operation):
+    return ClientError({'Error': {'Code': code, 'Message': 'rejected'}}, operation)
+
+def _metric(strategy_id='ursus_momentum_v1', timestamp='2025-01-31T14:05:00+00:00', win_rate=0.6):
+    return udl.StrategyMetric(strategy_id, timestamp, win_rate, 10, 125.0, 1.2, 0.05, 2, 30.0)
+
+def _make_logger(client, **kwargs):
+    data_logger = udl.UrsusDataLogger(**kwargs)
+    data_logger.__dict__['client'] = client  # pre-seed the lazily created client
+    return data_logger
+
+@pytest.fixture
+def ring_name():
+    pytest.importorskip('msgpack')
+    name = f"ursus_test_{uuid.uuid4().hex}"
+    yield name
+    shm_dir = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    path = os.path.join(shm_dir, name)
+    if os.path.exists(path):
+        os.remove(path)
+
+def test_builders_reject_non_finite_numbers_and_missing_keys():
+    data_logger = _make_logger(FakeClient())
+    try:
+        assert not data_logger.log_strategy_metrics(_metric(win_rate=float('nan')))
+        assert not data_logger.log_strategy_metrics(_metric(timestamp=None))
+        assert not data_logger.log_strategy_metrics(_metric(strategy_id=None))
+        assert data_logger.data_queue.qsize() == 0
+    finally:
+        data_logger.shutdown()
+
+def test_items_use_table_key_attributes():
+    trade = udl.TradeLog(None, '2025-01-31T23:30:00-02:00', 'ursus_momentum_v1', 'TSLA', 'BUY',
+                         100.0, 245.5, 0.85, 'BULLISH_MOMENTUM', 150.5)
+    item = udl._trade_to_ddb_item(trade)
+    assert item['TradeId'] == {'S': trade.trade_id}
+    assert item['Timestamp'] == {'S': trade.timestamp}
+    assert item['date_bucket'] == {'S': '2025-02-01'}
+
+@pytest.mark.parametrize('timestamp, bucket', [
+    ('2025-01-31T14:05:00Z', '2025-01-31'),
+    ('2025-01-31T14:05:00', '2025-01-31'),
+    ('2025-01-31 at close', '2025-01-31'),
+])
+def test_date_bucket_tolerates_loose_timestamps(timestamp, bucket):
+    assert udl._date_bucket(timestamp) == bucket
+
+def test_log_after_shutdown_is_rejected():
+    data_logger = _make_logger(FakeClient())
+    data_logger.shutdown()
+    assert not data_logger.log_strategy_metrics(_metric())
+    assert data_logger.data_queue.qsize() == 0
+
+def test_flush_writes_items_held_by_processor():
+    client = FakeClient()
+    data_logger = _make_logger(client)
+    try:
+        for i in range(3):
+            assert data_logger.log_strategy_metrics(_metric(timestamp=f"2025-01-31T14:05:0{i}+00:00"))
+        assert data_logger.flush() == 3
+        assert len(client.written) == 3
+    finally:
+        data_logger.shutdown()
+
+def test_flush_returns_when_processor_write_raises():
+    data_logger = _make_logger(FakeClient())
+
+    def broken_write(pending):
+        raise RuntimeError('boom')
+
+    data_logger._write_pending = broken_write
+    try:
+        assert data_logger.log_strategy_metrics(_metric())
+        assert data_logger.flush() == 0
+        assert data_logger.processor_thread.is_alive()
+    finally:
+        data_logger.shutdown()
+
+def test_ring_rewinds_on_transport_error_and_replays(ring_name):
+    offline = _make_logger(FakeClient(EndpointConnectionError(endpoint_url='https://dynamodb')),
+                           ring_name=ring_name)
+    for i in range(3):
+        assert offline.log_strategy_metrics(_metric(timestamp=f"2025-01-31T14:05:0{i}+00:00"))
+    assert offline.flush() == 0
+    offline.shutdown()
+
+    client = FakeClient()
+    with _make_logger(client, ring_name=ring_name) as replaying:
+        assert replaying.flush() == 3
+        assert replaying.data_queue.qsize() == 0
+    assert len(client.written) == 3
+
+    # Everything was acknowledged, so nothing is replayed again
+    with _make_logger(FakeClient(), ring_name=ring_name) as empty:
+        assert empty.flush() == 0
+
+def test_ring_dead_letters_rejected_items(ring_name, tmp_path):
+    dead_letter_path = tmp_path / 'dead_letter.jsonl'
+    client = FakeClient()
+    with _make_logger(client, ring_name=ring_name, dead_letter_path=str(dead_letter_path)) as data_logger:
+        assert data_logger.log_strategy_metrics(_metric(timestamp='2025-01-31T14:05:00+00:00'))
+        poison = udl._metric_to_ddb_item(_metric(timestamp='2025-01-31T14:05:01+00:00'))
+        poison['poison'] = {'S': 'yes'}
+        data_logger.data_queue.put(('metric', poison))
+        assert data_logger.log_strategy_metrics(_metric(timestamp='2025-01-31T14:05:02+00:00'))
+
+        assert data_logger.flush() == 2
+        assert data_logger.data_queue.qsize() == 0
+
+    assert len(client.written) == 2
+    records = [json.loads(line) for line in dead_letter_path.read_text().splitlines()]
+    assert len(records) == 1
+    assert records[0]['table'] == udl.STRATEGY_METRICS_TABLE
+    assert records[0]['item']['Timestamp'] == {'S': '2025-01-31T14:05:01+00:00'}
+
+    # The poison item was acknowledged rather than left to block the ring
+    with _make_logger(FakeClient(), ring_name=ring_name) as replaying:
+        assert replaying.flush() == 0
+
+def test_ring_admits_one_logger_at_a_time(ring_name):
+    with _make_logger(FakeClient(), ring_name=ring_name):
+        with pytest.raises(RuntimeError, match='already in use'):
+            udl.UrsusDataLogger(ring_name=ring_name)
+    _make_logger(FakeClient(), ring_name=ring_name).shutdown()
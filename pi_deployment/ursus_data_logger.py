@@ -6,18 +6,49 @@ Phase 1: Hybrid Data Backend
 """
 
 import boto3
+from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import Binary, TypeSerializer
+from botocore.config import Config
+from botocore.exceptions import ClientError
+import base64
+import functools
+import itertools
 import json
 import logging
+import math
 import os
+import secrets
 import uuid
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 import time
 import asyncio
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Any
+import collections
+import ctypes
+import mmap
+import struct
+import sys
+import tempfile
+from dataclasses import dataclass, fields
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 import threading
-from queue import Queue
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Empty, Full
+
+try:
+    import aioboto3  # Optional: only needed for AsyncUrsusDataLogger
+except ImportError:
+    aioboto3 = None
+
+try:
+    import msgpack  # Optional: packs MarketSignal.indicators into one Binary attribute
+except ImportError:
+    msgpack = None
+
+try:
+    import fcntl  # POSIX only: the ring buffer locks its file to a single logger
+except ImportError:
+    fcntl = None
 
 # Configure logging
 logging.basicConfig(
@@ -25,12 +56,47 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger('UrsusDataLogger')
+dead_letter_logger = logging.getLogger('UrsusDataLogger.deadletter')
+
+# DynamoDB tables (see aws_infrastructure/dynamodb_setup.sh)
+TRADE_LOGS_TABLE = 'CryonithTradeLogs'
+STRATEGY_METRICS_TABLE = 'CryonithStrategyMetrics'
+MARKET_SIGNALS_TABLE = 'CryonithMarketSignals'
+PERFORMANCE_TABLE = 'CryonithPerformance'
+
+# GSI on CryonithTradeLogs: date_bucket (HASH) + Timestamp (RANGE)
+TRADE_TIMESTAMP_INDEX = 'TradeLogs_TimestampIndex'
+
+# Default name of the crash-safe write buffer under /dev/shm
+DEFAULT_RING_NAME = 'ursus_ring'
+
+# Key condition builders reused by the query paths
+_STRATEGY_ID_KEY = Key('StrategyId')
+_TIMESTAMP_KEY = Key('Timestamp')
+_DATE_BUCKET_KEY = Key('date_bucket')
+
+# Error codes for which DynamoDB rejects the items themselves; retrying
+# them unchanged can never succeed, unlike throttling or transport errors
+_REJECTED_ITEM_ERRORS = frozenset((
+    'ValidationException',
+    'SerializationException',
+    'ItemCollectionSizeLimitExceededException',
+))
+
+# Sized for concurrent batch writers; adaptive retries back off on throttling
+DYNAMODB_CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=10
+)
 
 @dataclass
 class TradeLog:
     """Trade execution log entry"""
-    trade_id: str
-    timestamp: str
+    trade_id: Optional[str]  # None: assigned from the UUID pool when logged
+    timestamp: str  # ISO-8601, e.g. 2025-01-31T14:05:00.123+00:00; naive times are UTC
     strategy: str
     symbol: str
     action: str  # 'BUY', 'SELL', 'HOLD'
@@ -67,42 +133,415 @@ class MarketSignal:
     news_sentiment: Optional[float] = None
     volume_analysis: Optional[float] = None
 
+class _UuidPool:
+    """Pre-generated UUID4 strings, refilled from one urandom read per 1024 ids"""
+    
+    def __init__(self, size: int = 1024):
+        self.size = size
+        self._ids = collections.deque()
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        hex_ids = secrets.token_bytes(16 * self.size).hex()
+        ids = []
+        for i in range(0, len(hex_ids), 32):
+            h = hex_ids[i:i + 32]
+            # Set the RFC 4122 version (4) and variant (10xx) bits like uuid.uuid4()
+            variant = '89ab'[int(h[16], 16) & 3]
+            ids.append(f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{variant}{h[17:20]}-{h[20:]}")
+        self._ids.extend(ids)
+    
+    def next(self) -> str:
+        while True:
+            try:
+                return self._ids.popleft()
+            except IndexError:
+                with self._lock:
+                    if not self._ids:
+                        self._refill()
+
+    def _reset_after_fork(self):
+        # A forked child must not hand out the ids its parent will also use
+        self._ids.clear()
+        self._lock = threading.Lock()
+
+_trade_id_pool = _UuidPool()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_trade_id_pool._reset_after_fork)
+
+def next_trade_id() -> str:
+    """Return a fresh UUID4 string from the pre-generated pool"""
+    return _trade_id_pool.next()
+
+def _ensure_trade_id(trade: TradeLog) -> None:
+    if trade.trade_id is None:
+        trade.trade_id = next_trade_id()
+
+@functools.lru_cache(maxsize=1)
+def _format_epoch_ms(epoch_ms: int) -> str:
+    return datetime.fromtimestamp(epoch_ms / 1000, tz=timezone.utc).isoformat(timespec='milliseconds')
+
+def _now_iso() -> str:
+    """Current UTC time as ISO-8601, formatted at most once per millisecond"""
+    return _format_epoch_ms(time.time_ns() // 1_000_000)
+
+# Per-dataclass field layouts, resolved once so item builders skip asdict()
+_TRADE_FIELDS = tuple(f.name for f in fields(TradeLog))
+_TRADE_FLOAT_FIELDS = frozenset((
+    'quantity', 'price', 'confidence', 'execution_time_ms', 'profit_loss', 'portfolio_value'
+))
+_METRIC_FIELDS = tuple(f.name for f in fields(StrategyMetric))
+_METRIC_FLOAT_FIELDS = frozenset((
+    'win_rate', 'profit_loss', 'sharpe_ratio', 'max_drawdown', 'avg_hold_time'
+))
+# indicators is stored separately, see _pack_indicators()
+_SIGNAL_FIELDS = tuple(f.name for f in fields(MarketSignal) if f.name != 'indicators')
+_SIGNAL_FLOAT_FIELDS = frozenset(('strength', 'news_sentiment', 'volume_analysis'))
+
+# Key fields are stored under the tables' key attribute names (dynamodb_setup.sh)
+_KEY_ATTRIBUTES = {
+    'trade_id': 'TradeId',
+    'strategy_id': 'StrategyId',
+    'signal_id': 'SignalId',
+    'timestamp': 'Timestamp',
+}
+
+def _pack_indicators(indicators: Dict[str, float]) -> Optional[bytes]:
+    """msgpack-encode indicators as float32s, or None when msgpack is unavailable"""
+    if msgpack is None:
+        return None
+    return msgpack.packb(indicators, use_single_float=True)
+
+def decode_indicators(item: Dict[str, Any]) -> Dict[str, float]:
+    """Read indicators back from a stored market signal item (packed or Map form)"""
+    if 'indicators_mp' in item:
+        if msgpack is None:
+            raise ImportError("Decoding packed indicators requires msgpack: pip install msgpack")
+        packed = item['indicators_mp']
+        return msgpack.unpackb(packed.value if isinstance(packed, Binary) else packed)
+    return {k: float(v) for k, v in item.get('indicators', {}).items()}
+
+def _date_bucket(timestamp: str) -> str:
+    """UTC YYYY-MM-DD partition key for TRADE_TIMESTAMP_INDEX
+    
+    Naive timestamps are taken as UTC. A timestamp that is not ISO-8601 is
+    bucketed by its leading YYYY-MM-DD if it has one, else by today's UTC
+    date, rather than failing the write.
+    """
+    try:
+        # fromisoformat() only accepts a 'Z' suffix from Python 3.11
+        dt = datetime.fromisoformat(timestamp[:-1] + '+00:00' if timestamp.endswith('Z') else timestamp)
+    except ValueError:
+        try:
+            return date.fromisoformat(timestamp[:10]).isoformat()
+        except ValueError:
+            logger.warning(f"⚠️ Unparseable trade timestamp {timestamp!r}; bucketing under today's date")
+            return datetime.now(timezone.utc).date().isoformat()
+    if dt.tzinfo is None:
+        return dt.date().isoformat()
+    return dt.astimezone(timezone.utc).date().isoformat()
+
+def _ddb_number(value: Any, name: str) -> Dict[str, str]:
+    number = float(value)
+    if not math.isfinite(number):
+        # DynamoDB has no NaN/Infinity; fail at enqueue time rather than in a batch
+        raise ValueError(f"Non-finite value {number} for field {name}")
+    return {'N': repr(number)}
+
+def _dataclass_to_ddb_item(obj: Any, field_names: tuple, float_fields: frozenset) -> Dict[str, Dict]:
+    """Build a typed DynamoDB attribute map from a dataclass, skipping None values
+    
+    Raises ValueError for a missing key field or a non-finite float.
+    """
+    item = {}
+    for name in field_names:
+        value = getattr(obj, name)
+        attr = _KEY_ATTRIBUTES.get(name, name)
+        if value is None:
+            if attr != name:
+                raise ValueError(f"Missing key field {name}")
+            continue
+        if name in float_fields:
+            item[attr] = _ddb_number(value, name)
+        elif isinstance(value, str):
+            item[attr] = {'S': value}
+        elif isinstance(value, int):
+            item[attr] = {'N': str(value)}
+        else:
+            raise TypeError(f"Unsupported type {type(value).__name__} for field {name}")
+    return item
+
+def _trade_to_ddb_item(trade: TradeLog) -> Dict[str, Dict]:
+    _ensure_trade_id(trade)
+    item = _dataclass_to_ddb_item(trade, _TRADE_FIELDS, _TRADE_FLOAT_FIELDS)
+    item['date_bucket'] = {'S': _date_bucket(trade.timestamp)}
+    return item
+
+def _metric_to_ddb_item(metrics: StrategyMetric) -> Dict[str, Dict]:
+    return _dataclass_to_ddb_item(metrics, _METRIC_FIELDS, _METRIC_FLOAT_FIELDS)
+
+def _signal_to_ddb_item(signal: MarketSignal) -> Dict[str, Dict]:
+    item = _dataclass_to_ddb_item(signal, _SIGNAL_FIELDS, _SIGNAL_FLOAT_FIELDS)
+    packed = _pack_indicators(signal.indicators)
+    if packed is not None:
+        item['indicators_mp'] = {'B': packed}
+    else:
+        item['indicators'] = {'M': {k: _ddb_number(v, f'indicators.{k}') for k, v in signal.indicators.items()}}
+    return item
+
+class _ShmRingBuffer:
+    """Fixed-slot ring of msgpack records in a memory-mapped /dev/shm file
+    
+    Drop-in for the Queue calls UrsusDataLogger makes (put/get/get_nowait/
+    task_done). The persisted tail only advances on task_done(), i.e. after a
+    batch is written, so entries survive a crash and are replayed by the next
+    logger attached to the same ring. The read position is process-local, so
+    an exclusive flock on the file limits each ring to one logger at a time.
+    """
+    
+    _HEADER_SIZE = 64  # head (uint64) @0, tail (uint64) @8, slot_size (uint32) @16
+    _LENGTH = struct.Struct('<I')
+    
+    def __init__(self, name: str, size: int = 16 * 1024 * 1024, slot_size: int = 1024):
+        if msgpack is None:
+            raise ImportError("Ring buffer requires msgpack: pip install msgpack")
+        if fcntl is None:
+            raise ImportError("Ring buffer requires fcntl (POSIX only)")
+        shm_dir = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+        self.path = os.path.join(shm_dir, name)
+        # Held until close(); the kernel drops the lock if this process dies
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise RuntimeError(f"Ring buffer {self.path} is already in use by another logger") from None
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, size)
+            self._mm = mmap.mmap(self._fd, 0)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        
+        self._head = ctypes.c_uint64.from_buffer(self._mm, 0)
+        self._tail = ctypes.c_uint64.from_buffer(self._mm, 8)
+        self._slot_size = ctypes.c_uint32.from_buffer(self._mm, 16)
+        if self._slot_size.value == 0:  # freshly created ring
+            self._slot_size.value = slot_size
+        self.slot_size = self._slot_size.value
+        self.slot_count = (len(self._mm) - self._HEADER_SIZE) // self.slot_size
+        
+        # Entries between tail and head were never confirmed written; replay them
+        self._read = self._tail.value
+        self._not_empty = threading.Condition()
+        self.closed = False
+    
+    def _slot_offset(self, index: int) -> int:
+        return self._HEADER_SIZE + (index % self.slot_count) * self.slot_size
+    
+    def put(self, entry: Any) -> None:
+        record = msgpack.packb(entry, use_bin_type=True)
+        if len(record) + self._LENGTH.size > self.slot_size:
+            raise ValueError(f"Record of {len(record)} bytes exceeds ring slot size {self.slot_size}")
+        with self._not_empty:
+            if self.closed:
+                raise ValueError(f"Ring buffer {self.path} is closed")
+            head = self._head.value
+            if head - self._tail.value >= self.slot_count:
+                raise Full(f"Ring buffer {self.path} is full")
+            offset = self._slot_offset(head)
+            self._LENGTH.pack_into(self._mm, offset, len(record))
+            start = offset + self._LENGTH.size
+            self._mm[start:start + len(record)] = record
+            # Publish only once the slot is fully written
+            self._head.value = head + 1
+            self._not_empty.notify()
+    
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        with self._not_empty:
+            if not self._not_empty.wait_for(lambda: self.closed or self._read < self._head.value,
+                                            timeout if block else 0) or self.closed:
+                raise Empty
+            offset = self._slot_offset(self._read)
+            (length,) = self._LENGTH.unpack_from(self._mm, offset)
+            start = offset + self._LENGTH.size
+            record = self._mm[start:start + length]
+            self._read += 1
+        return msgpack.unpackb(record, raw=False)
+    
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+    
+    def rewind(self) -> None:
+        """Re-read every entry not yet acknowledged with task_done()"""
+        with self._not_empty:
+            if not self.closed:
+                self._read = self._tail.value
+    
+    def task_done(self) -> None:
+        with self._not_empty:
+            if self.closed:
+                raise ValueError(f"Ring buffer {self.path} is closed")
+            if self._tail.value >= self._read:
+                raise ValueError('task_done() called too many times')
+            self._tail.value += 1
+    
+    def qsize(self) -> int:
+        with self._not_empty:
+            return 0 if self.closed else self._head.value - self._read
+    
+    def close(self) -> None:
+        with self._not_empty:
+            if self.closed:
+                return
+            self.closed = True
+            # ctypes views export the mmap buffer and must be released before closing
+            del self._head, self._tail, self._slot_size
+            self._mm.close()
+            os.close(self._fd)  # releases the flock
+            self._not_empty.notify_all()
+
+def _is_rejected_item(error: Exception) -> bool:
+    return isinstance(error, ClientError) and error.response.get('Error', {}).get('Code') in _REJECTED_ITEM_ERRORS
+
+def _json_bytes(value: Any) -> str:
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode('ascii')
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class _aws_property(functools.cached_property):
+    """cached_property whose first computation holds the instance's _aws_lock
+    
+    boto3 Sessions are not thread-safe, and the first access can come from a
+    worker or processor thread. Once cached, reads bypass __get__ entirely.
+    """
+    
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        with instance._aws_lock:
+            return super().__get__(instance, owner)
+
+# Queue kind -> (table name, table key attributes used to de-dupe a batch)
+_BATCH_TARGETS = {
+    'trade': (TRADE_LOGS_TABLE, ('TradeId', 'Timestamp')),
+    'metric': (STRATEGY_METRICS_TABLE, ('StrategyId', 'Timestamp')),
+    'signal': (MARKET_SIGNALS_TABLE, ('SignalId', 'Timestamp')),
+}
+
 class UrsusDataLogger:
     """Main data logger class for Ursus trading system"""
     
-    def __init__(self, region_name='us-east-1'):
+    _serializer = TypeSerializer()
+    
+    def __init__(self, region_name='us-east-1', ring_name: Optional[str] = None,
+                 dead_letter_path: Optional[str] = None):
         self.region_name = region_name
-        self.session = boto3.Session(
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=region_name
-        )
-        self.dynamodb = self.session.resource('dynamodb')
         
-        # Initialize tables
-        self.trade_logs_table = self.dynamodb.Table('CryonithTradeLogs')
-        self.strategy_metrics_table = self.dynamodb.Table('CryonithStrategyMetrics')
-        self.market_signals_table = self.dynamodb.Table('CryonithMarketSignals')
-        self.performance_table = self.dynamodb.Table('CryonithPerformance')
+        # Items DynamoDB rejects outright go to dead_letter_logger and, if set,
+        # are appended to this JSON-lines file instead of blocking the queue
+        self.dead_letter_path = dead_letter_path
+        self._dead_letter_lock = threading.Lock()
         
-        # Queue for batch processing
-        self.data_queue = Queue()
+        # Queue for batch processing; a named ring buffer keeps pending writes
+        # in /dev/shm across process crashes (requires msgpack)
+        self.data_queue = _ShmRingBuffer(ring_name) if ring_name else Queue()
         self.batch_size = 25  # DynamoDB batch limit
         self.flush_interval = 30  # seconds
+        self.max_workers = 16  # concurrent BatchWriteItem calls in batch_log_trades
+        self.max_batch_retries = 5  # attempts at UnprocessedItems before giving up
         
-        # Start background processor
+        # Background processor is started on the first queued write
         self.running = True
-        self.processor_thread = threading.Thread(target=self._batch_processor)
-        self.processor_thread.daemon = True
-        self.processor_thread.start()
+        self._wake = threading.Event()
+        self._processor_lock = threading.Lock()
+        self._aws_lock = threading.RLock()
+        self.processor_thread = None
         
-        logger.info("🚀 Ursus Data Logger initialized")
+        # flush() hands a ('flush', token) marker to the processor and waits for it
+        self._flush_tokens = itertools.count()
+        self._flush_waiting = set()
+        self._flush_results = {}
+        self._flush_done = threading.Condition()
+        self._written_total = 0  # items written by the processor, guarded by _flush_done
         
+        logger.info("🚀 Ursus Data Logger initialized")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+    
+    # AWS resources are created on first use so construction stays cheap
+    @_aws_property
+    def session(self):
+        return boto3.Session(
+            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+            region_name=self.region_name
+        )
+    
+    @_aws_property
+    def dynamodb(self):
+        return self.session.resource('dynamodb', config=DYNAMODB_CLIENT_CONFIG)
+    
+    @_aws_property
+    def client(self):
+        # Low-level client for pre-serialized writes (skips resource-layer marshaling).
+        # Items are built from fixed dataclass layouts, so client-side validation is skipped.
+        return self.session.client(
+            'dynamodb',
+            config=DYNAMODB_CLIENT_CONFIG.merge(Config(parameter_validation=False))
+        )
+    
+    @_aws_property
+    def trade_logs_table(self):
+        return self.dynamodb.Table(TRADE_LOGS_TABLE)
+    
+    @_aws_property
+    def strategy_metrics_table(self):
+        return self.dynamodb.Table(STRATEGY_METRICS_TABLE)
+    
+    @_aws_property
+    def market_signals_table(self):
+        return self.dynamodb.Table(MARKET_SIGNALS_TABLE)
+    
+    @_aws_property
+    def performance_table(self):
+        return self.dynamodb.Table(PERFORMANCE_TABLE)
+    
+    def _ensure_processor(self):
+        """Start the background batch processor if it is not running yet"""
+        if self.processor_thread is not None:
+            return
+        with self._processor_lock:
+            if self.processor_thread is None and self.running:
+                self.processor_thread = threading.Thread(target=self._batch_processor)
+                self.processor_thread.daemon = True
+                self.processor_thread.start()
+    
     def log_trade(self, trade: TradeLog) -> bool:
-        """Log a trade execution"""
+        """Queue a trade execution for the next batch flush"""
+        if not self.running:
+            logger.error("❌ Failed to queue trade: logger is shut down")
+            return False
+        try:
+            self.data_queue.put(('trade', _trade_to_ddb_item(trade)))
+            self._ensure_processor()
+            logger.debug(f"📊 Trade queued: {trade.trade_id} - {trade.action} {trade.symbol}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to queue trade: {e}")
+            return False
+    
+    def log_trade_sync(self, trade: TradeLog) -> bool:
+        """Log a trade execution immediately, bypassing the batch queue"""
         try:
-            item = self._convert_decimals(asdict(trade))
-            self.trade_logs_table.put_item(Item=item)
+            self.client.put_item(
+                TableName=TRADE_LOGS_TABLE,
+                Item=_trade_to_ddb_item(trade)
+            )
             logger.info(f"📊 Trade logged: {trade.trade_id} - {trade.action} {trade.symbol}")
             return True
         except Exception as e:
@@ -110,25 +549,31 @@ class UrsusDataLogger:
             return False
     
     def log_strategy_metrics(self, metrics: StrategyMetric) -> bool:
-        """Log strategy performance metrics"""
+        """Queue strategy performance metrics for the next batch flush"""
+        if not self.running:
+            logger.error("❌ Failed to queue strategy metrics: logger is shut down")
+            return False
         try:
-            item = self._convert_decimals(asdict(metrics))
-            self.strategy_metrics_table.put_item(Item=item)
-            logger.info(f"🧠 Strategy metrics logged: {metrics.strategy_id}")
+            self.data_queue.put(('metric', _metric_to_ddb_item(metrics)))
+            self._ensure_processor()
+            logger.debug(f"🧠 Strategy metrics queued: {metrics.strategy_id}")
             return True
         except Exception as e:
-            logger.error(f"❌ Failed to log strategy metrics: {e}")
+            logger.error(f"❌ Failed to queue strategy metrics: {e}")
             return False
     
     def log_market_signal(self, signal: MarketSignal) -> bool:
-        """Log market analysis signal"""
+        """Queue a market analysis signal for the next batch flush"""
+        if not self.running:
+            logger.error("❌ Failed to queue market signal: logger is shut down")
+            return False
         try:
-            item = self._convert_decimals(asdict(signal))
-            self.market_signals_table.put_item(Item=item)
-            logger.info(f"📡 Market signal logged: {signal.signal_id} - {signal.signal_type}")
+            self.data_queue.put(('signal', _signal_to_ddb_item(signal)))
+            self._ensure_processor()
+            logger.debug(f"📡 Market signal queued: {signal.signal_id} - {signal.signal_type}")
             return True
         except Exception as e:
-            logger.error(f"❌ Failed to log market signal: {e}")
+            logger.error(f"❌ Failed to queue market signal: {e}")
             return False
     
     def log_daily_performance(self, date: str, metrics: Dict[str, float]) -> bool:
@@ -138,9 +583,12 @@ class UrsusDataLogger:
                 'MetricType': 'DAILY_PERFORMANCE',
                 'Date': date,
                 **self._convert_decimals(metrics),
-                'Timestamp': datetime.now(timezone.utc).isoformat()
+                'Timestamp': _now_iso()
             }
-            self.performance_table.put_item(Item=item)
+            self.client.put_item(
+                TableName=PERFORMANCE_TABLE,
+                Item=self._serialize_item(item)
+            )
             logger.info(f"📈 Daily performance logged for {date}")
             return True
         except Exception as e:
@@ -149,83 +597,474 @@ class UrsusDataLogger:
     
     def batch_log_trades(self, trades: List[TradeLog]) -> int:
         """Batch log multiple trades for efficiency"""
-        success_count = 0
+        if not trades:
+            return 0
         
-        # Process in batches of 25 (DynamoDB limit)
-        for i in range(0, len(trades), self.batch_size):
-            batch = trades[i:i + self.batch_size]
-            try:
-                with self.trade_logs_table.batch_writer() as batch_writer:
-                    for trade in batch:
-                        item = self._convert_decimals(asdict(trade))
-                        batch_writer.put_item(Item=item)
-                        success_count += 1
-                logger.info(f"📊 Batch logged {len(batch)} trades")
-            except Exception as e:
-                logger.error(f"❌ Failed to batch log trades: {e}")
+        # Process in batches of 25 (DynamoDB limit), sent concurrently
+        items = [_trade_to_ddb_item(trade) for trade in trades]
+        batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+        client = self.client  # resolved once here rather than inside the workers
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+            results = list(executor.map(
+                lambda batch: self._write_batch({TRADE_LOGS_TABLE: batch}, client), batches
+            ))
         
+        success_count = sum(written for written, _ in results)
+        logger.info(f"📊 Batch logged {success_count}/{len(trades)} trades")
         return success_count
     
+    def batch_log_mixed(self, trades: List[TradeLog], metrics: List[StrategyMetric],
+                        signals: List[MarketSignal]) -> int:
+        """Log trades, metrics and signals together, sharing BatchWriteItem calls"""
+        entries = (
+            [(TRADE_LOGS_TABLE, _trade_to_ddb_item(t)) for t in trades] +
+            [(STRATEGY_METRICS_TABLE, _metric_to_ddb_item(m)) for m in metrics] +
+            [(MARKET_SIGNALS_TABLE, _signal_to_ddb_item(s)) for s in signals]
+        )
+        success_count, _ = self._write_mixed(entries)
+        logger.info(f"📦 Batch logged {success_count}/{len(entries)} mixed items")
+        return success_count
+    
+    def _write_mixed(self, entries: List[Tuple[str, Dict]]) -> Tuple[int, bool]:
+        """Pack (table_name, item) entries into 25-item BatchWriteItem calls
+        
+        Returns the number of items written and whether every item was
+        settled, i.e. written or dead-lettered rather than left to retry.
+        """
+        written, complete = 0, True
+        for i in range(0, len(entries), self.batch_size):
+            items_by_table = {}
+            for table_name, item in entries[i:i + self.batch_size]:
+                items_by_table.setdefault(table_name, []).append(item)
+            batch_written, batch_complete = self._write_batch(items_by_table)
+            written += batch_written
+            complete = complete and batch_complete
+        return written, complete
+    
+    def _write_batch(self, items_by_table: Dict[str, List[Dict]], client=None) -> Tuple[int, bool]:
+        """Write up to 25 typed items (across tables) with one BatchWriteItem, retrying UnprocessedItems
+        
+        A batch DynamoDB rejects outright (e.g. ValidationException) is retried
+        item by item so one bad item cannot hold back the rest. Returns the
+        number written and whether every item was written or dead-lettered.
+        """
+        total = sum(len(items) for items in items_by_table.values())
+        if client is None:
+            client = self.client
+        try:
+            request_items = {
+                table_name: [{'PutRequest': {'Item': item}} for item in items]
+                for table_name, items in items_by_table.items()
+            }
+            for attempt in range(self.max_batch_retries):
+                response = client.batch_write_item(RequestItems=request_items)
+                request_items = response.get('UnprocessedItems') or {}
+                if not request_items:
+                    return total, True
+                time.sleep(0.05 * (2 ** attempt))
+            
+            unprocessed = sum(len(requests) for requests in request_items.values())
+            logger.error(f"❌ {unprocessed} items unprocessed in {list(request_items)} after {self.max_batch_retries} attempts")
+            return total - unprocessed, False
+        except Exception as e:
+            if not _is_rejected_item(e):
+                logger.error(f"❌ Failed to batch write {total} items to {list(items_by_table)}: {e}")
+                return 0, False
+            logger.warning(f"⚠️ Batch of {total} items rejected ({e}); retrying them one at a time")
+        return self._write_items(items_by_table, client)
+    
+    def _write_items(self, items_by_table: Dict[str, List[Dict]], client) -> Tuple[int, bool]:
+        """PutItem each item, dead-lettering those DynamoDB rejects
+        
+        Stops at the first throttling or transport error, leaving the
+        remaining items to be retried.
+        """
+        written = 0
+        for table_name, items in items_by_table.items():
+            for item in items:
+                try:
+                    client.put_item(TableName=table_name, Item=item)
+                    written += 1
+                except Exception as e:
+                    if not _is_rejected_item(e):
+                        logger.error(f"❌ Failed to write item to {table_name}: {e}")
+                        return written, False
+                    self._dead_letter(table_name, item, e)
+        return written, True
+    
+    def _dead_letter(self, table_name: str, item: Dict[str, Dict], error: Exception) -> None:
+        """Record an item DynamoDB will never accept so it stops blocking the queue"""
+        record = json.dumps(
+            {'timestamp': _now_iso(), 'table': table_name, 'error': str(error), 'item': item},
+            default=_json_bytes
+        )
+        dead_letter_logger.error(record)
+        if self.dead_letter_path:
+            with self._dead_letter_lock, open(self.dead_letter_path, 'a') as f:
+                f.write(record + '\n')
+    
     def get_strategy_performance(self, strategy_id: str, days: int = 7) -> List[Dict]:
         """Get recent strategy performance data"""
         try:
-            from datetime import timedelta
-            end_date = datetime.now(timezone.utc)
-            start_date = end_date - timedelta(days=days)
-            
-            response = self.strategy_metrics_table.query(
-                KeyConditionExpression=boto3.dynamodb.conditions.Key('StrategyId').eq(strategy_id) &
-                                     boto3.dynamodb.conditions.Key('Timestamp').between(
-                                         start_date.isoformat(),
-                                         end_date.isoformat()
-                                     )
-            )
-            return response.get('Items', [])
+            return list(self.iter_strategy_performance(strategy_id, days))
         except Exception as e:
             logger.error(f"❌ Failed to get strategy performance: {e}")
             return []
     
+    def iter_strategy_performance(self, strategy_id: str, days: int = 7) -> Iterator[Dict]:
+        """Lazily yield recent strategy performance data across all result pages"""
+        end_date = datetime.now(timezone.utc)
+        start_date = end_date - timedelta(days=days)
+        
+        yield from self._paginate_query(
+            TableName=STRATEGY_METRICS_TABLE,
+            KeyConditionExpression=_STRATEGY_ID_KEY.eq(strategy_id) &
+                                   _TIMESTAMP_KEY.between(start_date.isoformat(), end_date.isoformat())
+        )
+    
     def get_recent_trades(self, hours: int = 24) -> List[Dict]:
         """Get recent trades across all strategies"""
         try:
-            from datetime import timedelta
-            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
-            
-            response = self.trade_logs_table.scan(
-                FilterExpression=boto3.dynamodb.conditions.Attr('timestamp').gte(cutoff_time.isoformat())
-            )
-            return response.get('Items', [])
+            return list(self.iter_recent_trades(hours))
         except Exception as e:
             logger.error(f"❌ Failed to get recent trades: {e}")
             return []
     
+    def iter_recent_trades(self, hours: int = 24) -> Iterator[Dict]:
+        """Lazily yield recent trades across all strategies"""
+        now = datetime.now(timezone.utc)
+        cutoff_time = now - timedelta(hours=hours)
+        cutoff_iso = cutoff_time.isoformat()
+        
+        # Query each daily bucket in the window instead of scanning the table
+        day = cutoff_time.date()
+        while day <= now.date():
+            yield from self._paginate_query(
+                TableName=TRADE_LOGS_TABLE,
+                IndexName=TRADE_TIMESTAMP_INDEX,
+                KeyConditionExpression=_DATE_BUCKET_KEY.eq(day.isoformat()) &
+                                       _TIMESTAMP_KEY.gte(cutoff_iso)
+            )
+            day += timedelta(days=1)
+    
+    def _paginate_query(self, **query_kwargs) -> Iterator[Dict]:
+        """Yield items from every page of a Query, past DynamoDB's 1 MB page cap"""
+        paginator = self.dynamodb.meta.client.get_paginator('query')
+        for page in paginator.paginate(PaginationConfig={'PageSize': 1000}, **query_kwargs):
+            yield from page.get('Items', [])
+    
+    def _serialize_item(self, item: Dict[str, Any]) -> Dict[str, Dict]:
+        """Convert a Python item to DynamoDB's typed attribute map"""
+        return self._serializer.serialize(item)['M']
+    
     def _convert_decimals(self, data: Any) -> Any:
         """Convert floats to Decimal for DynamoDB"""
-        if isinstance(data, dict):
-            return {k: self._convert_decimals(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self._convert_decimals(item) for item in data]
-        elif isinstance(data, float):
-            return Decimal(str(data))
-        return data
+        if isinstance(data, float):
+            return Decimal(repr(data))
+        if not isinstance(data, (dict, list)):
+            return data
+        
+        # Walk nested containers with an explicit stack instead of recursion
+        root = {} if isinstance(data, dict) else [None] * len(data)
+        stack = [(data, root)]
+        while stack:
+            src, dst = stack.pop()
+            for key, value in (src.items() if isinstance(src, dict) else enumerate(src)):
+                if isinstance(value, float):
+                    value = Decimal(repr(value))
+                elif isinstance(value, dict):
+                    stack.append((value, {}))
+                    value = stack[-1][1]
+                elif isinstance(value, list):
+                    stack.append((value, [None] * len(value)))
+                    value = stack[-1][1]
+                dst[key] = value
+        return root
+    
+    def flush(self) -> int:
+        """Write every item queued before this call with BatchWriteItem"""
+        thread = self.processor_thread
+        if thread is not None and thread.is_alive():
+            # The processor may hold dequeued items; queue a marker behind
+            # them and wait until it has written through the marker
+            token = next(self._flush_tokens)
+            with self._flush_done:
+                written_before = self._written_total
+                self._flush_waiting.add(token)
+                self.data_queue.put(('flush', token))
+                while token not in self._flush_results and thread.is_alive():
+                    self._flush_done.wait(0.5)
+                self._flush_waiting.discard(token)
+                if token in self._flush_results:
+                    return self._flush_results.pop(token) - written_before
+        
+        # No processor running: drain the queue on this thread
+        pending = []
+        taken = 0
+        while True:
+            try:
+                entry = self.data_queue.get_nowait()
+            except Empty:
+                break
+            taken += 1
+            if entry is not None and entry[0] != 'flush':
+                pending.append(entry)
+        written, _ = self._write_swapped(pending, taken, [])
+        return written
+    
+    def _settle(self, count: int, complete: bool) -> None:
+        """Acknowledge dequeued entries once their batch has been fully written
+        
+        On a throttling or transport failure a ring buffer rewinds to its
+        persisted tail, so the entries are retried by the next flush or
+        replayed after a restart; items DynamoDB rejects are dead-lettered
+        instead and count as settled. The in-process Queue cannot hold
+        failed entries, so they are dropped as before.
+        """
+        if not complete and isinstance(self.data_queue, _ShmRingBuffer):
+            self.data_queue.rewind()
+            return
+        for _ in range(count):
+            self.data_queue.task_done()
+    
+    def _write_pending(self, pending: List[Tuple[str, Dict]]) -> Tuple[int, bool]:
+        """Group queued (kind, item) entries by table and batch write them
+        
+        Returns the number of items written and whether all of them were
+        settled (written or dead-lettered).
+        """
+        if not pending:
+            return 0, True
+        
+        grouped = {kind: [] for kind in _BATCH_TARGETS}
+        for kind, item in pending:
+            grouped[kind].append(item)
+        
+        entries = []
+        for kind, items in grouped.items():
+            table_name, pkeys = _BATCH_TARGETS[kind]
+            # BatchWriteItem rejects duplicate keys in one request; keep the latest
+            deduped = {tuple(item[k]['S'] for k in pkeys): item for item in items}
+            entries.extend((table_name, item) for item in deduped.values())
+        written, complete = self._write_mixed(entries)
+        
+        if written:
+            logger.info(f"📤 Flushed {written} queued items")
+        return written, complete
     
     def _batch_processor(self):
-        """Background thread for batch processing queued data"""
-        while self.running:
+        """Background thread for batch processing queued data
+        
+        Flushes as soon as batch_size items are pending or flush_interval has
+        elapsed, whichever comes first. shutdown() wakes it via _wake and a
+        None sentinel on the queue.
+        """
+        pending = []
+        taken = 0  # entries dequeued (including markers) but not yet acknowledged
+        flush_tokens = []  # flush() calls waiting on this batch
+        deadline = time.monotonic() + self.flush_interval
+        
+        def take(entry):
+            nonlocal taken
+            taken += 1
+            if entry is None:
+                return
+            if entry[0] == 'flush':
+                flush_tokens.append(entry[1])
+            else:
+                pending.append(entry)
+        
+        while self.running and not self._wake.is_set():
             try:
-                time.sleep(self.flush_interval)
-                # Process any queued data here if needed
-                pass
+                try:
+                    take(self.data_queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                    while len(pending) < self.batch_size and not flush_tokens:
+                        take(self.data_queue.get_nowait())
+                except Empty:
+                    pass
+                
+                if flush_tokens or len(pending) >= self.batch_size or time.monotonic() >= deadline:
+                    batch, pending = pending, []
+                    done, taken = taken, 0
+                    tokens, flush_tokens = flush_tokens, []
+                    _, complete = self._write_swapped(batch, done, tokens)
+                    if not complete:
+                        # Back off before retrying (e.g. during a network outage)
+                        self._wake.wait(self.flush_interval)
+                    deadline = time.monotonic() + self.flush_interval
             except Exception as e:
                 logger.error(f"❌ Batch processor error: {e}")
+        
+        self._write_swapped(pending, taken, flush_tokens)
+    
+    def _write_swapped(self, batch: List[Tuple[str, Dict]], taken: int,
+                       tokens: List[int]) -> Tuple[int, bool]:
+        """Write a batch taken off the queue, as _write_pending() does
+        
+        Whatever happens, its entries are settled and its flush() callers
+        released, so an unexpected error can neither strand ring entries
+        nor leave flush() waiting.
+        """
+        written, complete = 0, False
+        try:
+            written, complete = self._write_pending(batch)
+        except Exception as e:
+            logger.error(f"❌ Failed to write {len(batch)} queued items: {e}")
+        finally:
+            try:
+                self._settle(taken, complete)
+            finally:
+                self._record_written(written, tokens)
+        return written, complete
+    
+    def _record_written(self, written: int, tokens: List[int]):
+        """Count a processor batch and wake flush() calls whose marker it included"""
+        with self._flush_done:
+            self._written_total += written
+            for token in tokens:
+                # Markers replayed from a ring buffer may have no waiter left
+                if token in self._flush_waiting:
+                    self._flush_results[token] = self._written_total
+            if tokens:
+                self._flush_done.notify_all()
     
     def shutdown(self):
-        """Gracefully shutdown the logger"""
-        self.running = False
-        if self.processor_thread.is_alive():
-            self.processor_thread.join(timeout=5)
+        """Gracefully shutdown the logger (later calls are no-ops)"""
+        with self._processor_lock:
+            if not self.running:
+                return
+            self.running = False
+        self._wake.set()
+        try:
+            self.data_queue.put(None)
+        except Full:
+            pass  # a full ring wakes the processor anyway
+        
+        thread = self.processor_thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=5)
+            if thread.is_alive():
+                # Still writing; leave the queue to it rather than racing it
+                logger.warning("⚠️ Batch processor still running; skipping final flush")
+                return
+        
+        self.flush()
+        if isinstance(self.data_queue, _ShmRingBuffer):
+            self.data_queue.close()
         logger.info("🛑 Ursus Data Logger shutdown complete")
 
+class AsyncUrsusDataLogger:
+    """Async data logger that overlaps DynamoDB round-trips on one event loop
+    
+    Requires aioboto3. Use as ``async with AsyncUrsusDataLogger() as logger:``.
+    """
+    
+    def __init__(self, region_name='us-east-1', max_pool_connections=10):
+        if aioboto3 is None:
+            raise ImportError("AsyncUrsusDataLogger requires aioboto3: pip install aioboto3")
+        self.region_name = region_name
+        self.batch_size = 25  # DynamoDB batch limit
+        self.max_batch_retries = 5  # attempts at UnprocessedItems before giving up
+        self.max_pool_connections = max_pool_connections
+        self.session = aioboto3.Session(
+            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+            region_name=region_name
+        )
+        self._client_ctx = None
+        self.client = None
+        
+    async def __aenter__(self):
+        # Low-level client with the same typed items as the sync batch path
+        self._client_ctx = self.session.client(
+            'dynamodb',
+            config=DYNAMODB_CLIENT_CONFIG.merge(Config(
+                max_pool_connections=self.max_pool_connections,
+                parameter_validation=False
+            ))
+        )
+        self.client = await self._client_ctx.__aenter__()
+        
+        # Bound in-flight requests to the connection pool size
+        self._semaphore = asyncio.Semaphore(self.max_pool_connections)
+        logger.info("🚀 Async Ursus Data Logger initialized")
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._client_ctx.__aexit__(exc_type, exc, tb)
+        self.client = None
+        logger.info("🛑 Async Ursus Data Logger shutdown complete")
+    
+    async def _put(self, table_name: str, item: Dict[str, Dict]) -> None:
+        async with self._semaphore:
+            await self.client.put_item(TableName=table_name, Item=item)
+    
+    async def alog_trade(self, trade: TradeLog) -> bool:
+        """Log a trade execution"""
+        try:
+            await self._put(TRADE_LOGS_TABLE, _trade_to_ddb_item(trade))
+            logger.info(f"📊 Trade logged: {trade.trade_id} - {trade.action} {trade.symbol}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to log trade: {e}")
+            return False
+    
+    async def alog_strategy_metrics(self, metrics: StrategyMetric) -> bool:
+        """Log strategy performance metrics"""
+        try:
+            await self._put(STRATEGY_METRICS_TABLE, _metric_to_ddb_item(metrics))
+            logger.info(f"🧠 Strategy metrics logged: {metrics.strategy_id}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to log strategy metrics: {e}")
+            return False
+    
+    async def alog_market_signal(self, signal: MarketSignal) -> bool:
+        """Log market analysis signal"""
+        try:
+            await self._put(MARKET_SIGNALS_TABLE, _signal_to_ddb_item(signal))
+            logger.info(f"📡 Market signal logged: {signal.signal_id} - {signal.signal_type}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to log market signal: {e}")
+            return False
+    
+    async def _write_trade_batch(self, batch: List[TradeLog]) -> int:
+        """Write up to 25 trades with one BatchWriteItem, retrying UnprocessedItems"""
+        try:
+            request_items = {
+                TRADE_LOGS_TABLE: [{'PutRequest': {'Item': _trade_to_ddb_item(trade)}} for trade in batch]
+            }
+            async with self._semaphore:
+                for attempt in range(self.max_batch_retries):
+                    response = await self.client.batch_write_item(RequestItems=request_items)
+                    request_items = response.get('UnprocessedItems') or {}
+                    if not request_items:
+                        break
+                    await asyncio.sleep(0.05 * (2 ** attempt))
+            
+            unprocessed = sum(len(requests) for requests in request_items.values())
+            if unprocessed:
+                logger.error(f"❌ {unprocessed} trades unprocessed after {self.max_batch_retries} attempts")
+            logger.info(f"📊 Batch logged {len(batch) - unprocessed} trades")
+            return len(batch) - unprocessed
+        except Exception as e:
+            logger.error(f"❌ Failed to batch log trades: {e}")
+            return 0
+    
+    async def abatch_log_trades(self, trades: List[TradeLog]) -> int:
+        """Batch log multiple trades, sending the 25-item batches concurrently"""
+        batches = [trades[i:i + self.batch_size] for i in range(0, len(trades), self.batch_size)]
+        results = await asyncio.gather(*[self._write_trade_batch(batch) for batch in batches])
+        return sum(results)
+
+def replay_ring_buffer(ring_name: str = DEFAULT_RING_NAME, region_name: str = 'us-east-1',
+                       dead_letter_path: Optional[str] = None) -> int:
+    """Write entries left in a ring buffer by a crashed logger to DynamoDB"""
+    with UrsusDataLogger(region_name=region_name, ring_name=ring_name,
+                         dead_letter_path=dead_letter_path) as ring_logger:
+        return ring_logger.flush()
+
 # Example usage and testing functions
 def simulate_ursus_trading():
     """Simulate Ursus trading activity for testing"""
@@ -233,8 +1072,8 @@ def simulate_ursus_trading():
     
     # Simulate a trade
     trade = TradeLog(
-        trade_id=str(uuid.uuid4()),
-        timestamp=datetime.now(timezone.utc).isoformat(),
+        trade_id=None,  # assigned by the logger
+        timestamp=_now_iso(),
         strategy="ursus_momentum_v1",
         symbol="TSLA",
         action="BUY",
@@ -246,14 +1085,10 @@ def simulate_ursus_trading():
         portfolio_value=50000.0
     )
     
-    # Log the trade
-    success = logger.log_trade(trade)
-    print(f"Trade logging: {'✅ Success' if success else '❌ Failed'}")
-    
     # Simulate strategy metrics
     metrics = StrategyMetric(
         strategy_id="ursus_momentum_v1",
-        timestamp=datetime.now(timezone.utc).isoformat(),
+        timestamp=_now_iso(),
         win_rate=0.68,
         total_trades=45,
         profit_loss=2750.50,
@@ -263,12 +1098,10 @@ def simulate_ursus_trading():
         avg_hold_time=4.5
     )
     
-    logger.log_strategy_metrics(metrics)
-    
     # Simulate market signal
     signal = MarketSignal(
         signal_id=str(uuid.uuid4()),
-        timestamp=datetime.now(timezone.utc).isoformat(),
+        timestamp=_now_iso(),
         symbol="TSLA",
         signal_type="BUY",
         strength=0.82,
@@ -281,7 +1114,9 @@ def simulate_ursus_trading():
         news_sentiment=0.7
     )
     
-    logger.log_market_signal(signal)
+    # Log all three rows in a single BatchWriteItem
+    written = logger.batch_log_mixed([trade], [metrics], [signal])
+    print(f"Trade logging: {'✅ Success' if written == 3 else '❌ Failed'}")
     
     return logger
 
@@ -300,6 +1135,12 @@ if __name__ == "__main__":
             print(f"export {var}=your_value_here")
         exit(1)
     
+    # Drain a crashed logger's ring buffer: ursus_data_logger.py --replay [ring_name]
+    if len(sys.argv) > 1 and sys.argv[1] == '--replay':
+        ring_name = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_RING_NAME
+        print(f"♻️ Replayed {replay_ring_buffer(ring_name)} entries from {ring_name}")
+        exit(0)
+    
     try:
         # Run simulation
         logger = simulate_ursus_trading()